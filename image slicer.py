@@ -1,9 +1,123 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk, ImageDraw
+from PIL import Image, ImageTk
 import os
 import datetime
 import math # Import the math module for floor and ceil
+import sys
+import threading
+import queue
+import concurrent.futures
+import collections
+import image_slicer_core # GUI-free crop/feather/inpaint pipeline, also usable from the command line
+
+# Number of worker threads used by "Process and Save" (one per CPU core)
+EXPORT_WORKERS = os.cpu_count() or 1
+# How often (ms) the Tk thread checks the export workers for finished files
+EXPORT_POLL_MS = 50
+
+# Viewport settings
+TILE_SIZE = 256 # Size in pixels of the tiles the displayed image is cut into
+TILE_CACHE_PIXELS = 256 * TILE_SIZE * TILE_SIZE # Total size (pixels) of the converted tiles (PhotoImage) kept for reuse
+ZOOM_STEP = 1.25 # Zoom factor applied per mouse wheel notch
+MAX_ZOOM = 16.0 # Largest zoom, in screen pixels per image pixel
+PYRAMID_POLL_MS = 100 # How often (ms) the Tk thread checks for newly built pyramid levels
+CLICK_SLOP = 3 # Canvas pixels the mouse may move and still count as a click (picks a selection)
+FRAME_MS = 16 # Mouse motion, zooming and panning are coalesced into one canvas update per frame (~60 fps)
+
+class TilePyramid:
+    """
+    Multi-resolution copy of an image for the viewport. Level k is the image shrunk
+    by 2**k, level 0 is the full image, decoded by image_slicer_core.open_source_image
+    (kept as compact L/RGB/RGBA). Only the file header is read up front. For JPEGs the
+    level needed for the first paint is made right away, decoded straight at that
+    reduced size with Image.draft. Draft only works for JPEG, so the first paint of any
+    other format (PNG, BMP, TIFF...) waits for the full decode; that runs on the
+    background thread, so the window stays responsive but blank until then. The full image
+    and the remaining levels are built on that thread, each level from the one below
+    it, so zooming out never has to touch the full image again.
+    """
+    def __init__(self, image_path, tile_size=TILE_SIZE):
+        self.image_path = image_path
+        with image_slicer_core.open_image(image_path) as header: # Lazy, nothing is decoded yet
+            self.size = header.size
+            self.format = header.format
+        self.tile_size = tile_size
+        self.levels = {} # Level number -> PIL image, filled in by the builder thread
+        self.top_level = 0 # The first level that fits in a single tile
+        while max(self.size) > tile_size << self.top_level:
+            self.top_level += 1
+        self.complete = False
+        self.cancelled = False
+        self.error = None # Exception raised by the builder thread, if any
+
+    @property
+    def image(self):
+        """The full-resolution image, or None while it is still being decoded."""
+        return self.levels.get(0)
+
+    def level_for_scale(self, scale):
+        """Returns the coarsest level that still has at least one pixel per screen pixel."""
+        level = 0
+        while level < self.top_level and 2 ** (level + 1) <= 1 / scale:
+            level += 1
+        return level
+
+    def best_ready_level(self, scale):
+        """
+        Like level_for_scale, but falls back to the closest level that is already built,
+        preferring finer ones. Returns None if nothing is built yet.
+        """
+        wanted = self.level_for_scale(scale)
+        for level in list(range(wanted, -1, -1)) + list(range(wanted + 1, self.top_level + 1)):
+            if level in self.levels:
+                return level
+        return None
+
+    def level_size(self, level):
+        factor = 2 ** level
+        return (-(-self.size[0] // factor), -(-self.size[1] // factor)) # Same rounding as Image.reduce
+
+    def build_level_now(self, scale):
+        """
+        Builds the level for this scale for the first paint if that is cheap, i.e. a reduced
+        JPEG decode. Anything needing the full decode is left to the background thread,
+        so a big PNG does not freeze the window while it loads.
+        """
+        level = self.level_for_scale(scale)
+        if level in self.levels or level == 0 or self.format != "JPEG":
+            return
+        # The JPEG decoder can scale down by up to 8 while decoding, far cheaper than a full decode
+        with image_slicer_core.open_image(self.image_path) as preview:
+            preview.draft("RGB", self.level_size(level))
+            preview = preview.convert("RGB")
+        self.levels[level] = preview.resize(self.level_size(level), Image.Resampling.BILINEAR)
+
+    def start(self):
+        threading.Thread(target=self._build_levels, daemon=True).start()
+
+    def _build_levels(self):
+        try:
+            self.levels[0] = image_slicer_core.open_source_image(self.image_path)
+            for level in range(1, self.top_level + 1):
+                if self.cancelled:
+                    return
+                if level not in self.levels:
+                    self.levels[level] = self.levels[level - 1].reduce(2)
+        except Exception as e:
+            self.error = e
+        self.complete = True
+
+    def tile(self, level, column, row):
+        """Crops one tile out of a level; returns it with its box in full-image coordinates."""
+        factor = 2 ** level
+        level_image = self.levels[level]
+        x1, y1 = column * self.tile_size, row * self.tile_size
+        x2 = min(x1 + self.tile_size, level_image.width)
+        y2 = min(y1 + self.tile_size, level_image.height)
+        box = (x1 * factor, y1 * factor,
+               min(x2 * factor, self.size[0]), min(y2 * factor, self.size[1]))
+        return level_image.crop((x1, y1, x2, y2)), box
 
 class ImagePartSelectorApp:
     def __init__(self, root):
@@ -12,14 +126,35 @@ class ImagePartSelectorApp:
         self.root.geometry("800x600") # Set initial window size
 
         self.original_image_path = None
-        self.original_image = None # This will now be in RGBA mode
-        self.tk_image = None # PhotoImage for Tkinter display
-        self.image_on_canvas_id = None # Store the ID of the image item on the canvas
-        self.selected_regions = [] # Stores (x1, y1, x2, y2) for each selection in ORIGINAL IMAGE coordinates
+        self.original_image = None # Decoded full image (L, RGB or RGBA), None until decoding has finished
+        self.image_size = None # (width, height) of the image, known as soon as its header is read
+        # Stores (x1, y1, x2, y2) for each selection in ORIGINAL IMAGE coordinates, indexed for hit-testing, with undo/redo
+        self.selected_regions = image_slicer_core.RegionIndex()
+        self.active_region_id = None # Selection picked by clicking on it, drawn highlighted
 
         self.start_x = None
         self.start_y = None
         self.current_rectangle_id = None
+        self.drag_bbox = None # Image box on the canvas, cached when a drag starts (zoom and pan cancel drags)
+        self.drag_point = None # Latest mouse position of the drag, not drawn yet
+
+        # Viewport: the image is drawn from a tile pyramid at view_scale screen pixels per
+        # image pixel, with the image's top-left corner at canvas position (view_x, view_y)
+        self.pyramid = None
+        self.drawn_level = None # Pyramid level the tiles on the canvas come from
+        self.view_scale = 1.0
+        self.min_scale = 1.0
+        self.view_x = 0.0
+        self.view_y = 0.0
+        self.pan_start = None
+        self.drawn_view = None # (view_x, view_y, view_scale) the selection overlay is drawn at, None if not drawn
+        self.view_dirty = False # View changed since the tiles were last drawn
+        self.frame_after_id = None # Pending after() that draws the next frame
+        self.tile_cache = collections.OrderedDict() # (level, column, row, width, height, source box) -> PhotoImage
+        self.tile_cache_pixels = 0 # Pixels of all the PhotoImages in tile_cache
+        self.visible_tiles = [] # PhotoImages on the canvas right now, Tk needs them kept alive
+
+        self.export_executor = None # Worker pool of the running export, None when idle
 
         self._create_widgets()
 
@@ -39,6 +174,17 @@ class ImagePartSelectorApp:
         self.process_save_btn.pack(side=tk.LEFT, padx=5)
         self.process_save_btn.config(state=tk.DISABLED) # Disable until image is loaded
 
+        self.cancel_export_btn = tk.Button(button_frame, text="Cancel", command=self._cancel_export)
+        self.cancel_export_btn.pack(side=tk.LEFT, padx=5)
+        self.cancel_export_btn.config(state=tk.DISABLED) # Only enabled while an export is running
+
+        # Cropped mode saves each part at its own size and records its position in a JSON manifest,
+        # instead of pasting it onto a transparent canvas as big as the original image
+        self.export_cropped_var = tk.BooleanVar(value=False)
+        self.export_cropped_check = tk.Checkbutton(button_frame, text="Cropped parts + manifest",
+                                                   variable=self.export_cropped_var)
+        self.export_cropped_check.pack(side=tk.LEFT, padx=5)
+
         # Canvas for image display and selection
         self.canvas = tk.Canvas(self.root, bg="lightgray", bd=2, relief=tk.SUNKEN)
         self.canvas.pack(fill=tk.BOTH, expand=True)
@@ -48,6 +194,23 @@ class ImagePartSelectorApp:
         self.canvas.bind("<B1-Motion>", self._on_mouse_drag)
         self.canvas.bind("<ButtonRelease-1>", self._on_mouse_up)
 
+        # Mouse wheel zooms around the cursor (Windows/macOS send <MouseWheel>, X11 buttons 4/5),
+        # dragging with the middle button pans
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self._on_mouse_wheel)
+        self.canvas.bind("<ButtonPress-2>", self._on_pan_start)
+        self.canvas.bind("<B2-Motion>", self._on_pan_drag)
+        self.canvas.bind("<Configure>", lambda event: self._request_redraw())
+
+        # Clicking a selection picks it; Delete removes the picked one, right-click removes the one under the cursor
+        self.canvas.bind("<Button-3>", self._on_right_click)
+        self.root.bind("<Delete>", lambda event: self._delete_active_region())
+        self.root.bind("<BackSpace>", lambda event: self._delete_active_region())
+        self.root.bind("<Control-z>", lambda event: self._undo_selection())
+        self.root.bind("<Control-y>", lambda event: self._redo_selection())
+        self.root.bind("<Control-Z>", lambda event: self._redo_selection()) # Ctrl+Shift+Z
+
         # Status Label
         self.status_label = tk.Label(self.root, text="Please select an image.", bd=1, relief=tk.SUNKEN, anchor=tk.W)
         self.status_label.pack(side=tk.BOTTOM, fill=tk.X, ipady=2)
@@ -61,65 +224,60 @@ class ImagePartSelectorApp:
         if file_path:
             self.original_image_path = file_path
             try:
-                # Open the image using PIL and convert to RGBA for transparency support
-                self.original_image = Image.open(self.original_image_path).convert("RGBA")
-
                 # Clear previous canvas content and selections
                 self.canvas.delete("all")
-                self.selected_regions = [] # Reset selected regions for new image
-                self.image_on_canvas_id = None # Reset image ID
+                self.selected_regions = image_slicer_core.RegionIndex() # Reset selected regions (and their history) for new image
+                self.active_region_id = None
+                self._reset_view()
+
+                # Only the header is read here; the pixels are decoded by the pyramid
+                self.pyramid = TilePyramid(file_path)
+                self.image_size = self.pyramid.size
 
                 # Force canvas to update its size based on its pack/grid settings
                 self.root.update_idletasks() 
-                canvas_width = self.canvas.winfo_width()
-                canvas_height = self.canvas.winfo_height()
-
-                # Calculate aspect ratios and determine how to scale the image
-                img_aspect = self.original_image.width / self.original_image.height
-                canvas_aspect = canvas_width / canvas_height
-
-                if img_aspect > canvas_aspect:
-                    # Image is wider relative to its height than the canvas
-                    new_width = canvas_width
-                    new_height = int(canvas_width / img_aspect)
-                else:
-                    # Image is taller relative to its width than the canvas, or aspect is similar
-                    new_height = canvas_height
-                    new_width = int(canvas_height * img_aspect)
-
-                # Resize image using LANCZOS for quality and convert to PhotoImage
-                # Note: Tkinter's PhotoImage might not render transparency perfectly on display
-                # but PIL's Image operations will respect it for saving.
-                resized_image = self.original_image.copy()
-                resized_image.thumbnail((new_width, new_height), Image.Resampling.LANCZOS)
-                self.tk_image = ImageTk.PhotoImage(resized_image)
-
-                # Display the image, centered on the canvas, and store its ID
-                x_center = canvas_width / 2
-                y_center = canvas_height / 2
-                self.image_on_canvas_id = self.canvas.create_image(x_center, y_center, image=self.tk_image, anchor=tk.CENTER)
-
-                self.status_label.config(text=f"Image loaded: {os.path.basename(file_path)}. Click and drag to select parts.")
+
+                # Fit the image in the canvas (never enlarged past 100%) and paint a JPEG preview if one is
+                # cheap; the full image and other levels are built in the background and painted as they arrive
+                self._fit_view()
+                self.pyramid.build_level_now(self.view_scale)
+                self.original_image = None # Set by _poll_pyramid once the full decode has finished
+                self._redraw_view()
+                self.pyramid.start()
+                self.root.after(PYRAMID_POLL_MS, self._poll_pyramid, self.pyramid)
+
+                self.status_label.config(text=f"Image loaded: {os.path.basename(file_path)}. Click and drag to select parts, "
+                                              f"click a part to pick it (Delete/right-click removes, Ctrl+Z undoes), "
+                                              f"mouse wheel to zoom, middle button to pan.{self._memory_note()}")
                 self.clear_selections_btn.config(state=tk.NORMAL)
                 self.process_save_btn.config(state=tk.NORMAL)
 
             except Exception as e:
-                messagebox.showerror("Error", f"Could not open image: {e}")
-                self.original_image_path = None
-                self.original_image = None
-                self.tk_image = None
-                self.canvas.delete("all")
-                self.image_on_canvas_id = None
-                self.status_label.config(text="Failed to load image. Please select another.")
-                self.clear_selections_btn.config(state=tk.DISABLED)
-                self.process_save_btn.config(state=tk.DISABLED)
+                self._on_load_failed(e)
+
+    def _on_load_failed(self, error):
+        messagebox.showerror("Error", f"Could not open image: {error}")
+        self.original_image_path = None
+        self.original_image = None
+        self.image_size = None
+        self.canvas.delete("all")
+        self._reset_view()
+        self.status_label.config(text="Failed to load image. Please select another.")
+        self.clear_selections_btn.config(state=tk.DISABLED)
+        self.process_save_btn.config(state=tk.DISABLED)
+
+    def _memory_note(self):
+        peak = image_slicer_core.peak_memory_mb()
+        return f" Peak memory: {peak:.0f} MB." if peak else ""
 
     def _on_mouse_down(self, event):
         """Starts drawing a rectangle when mouse button 1 is pressed."""
-        if self.original_image and self.image_on_canvas_id:
-            # Get the bounding box of the displayed image on the canvas
-            img_bbox = self.canvas.bbox(self.image_on_canvas_id)
-            if not img_bbox: return # Should not happen if image_on_canvas_id exists
+        if self.pyramid:
+            self._render_frame() # Catch up with a pending zoom or pan first, the drag is relative to what is shown
+
+            # Get the bounding box of the displayed image on the canvas, it stays valid for the whole drag
+            img_bbox = self._image_bbox()
+            self.drag_bbox = img_bbox
 
             # Clamp the starting coordinates to be within the image display bounds
             self.start_x = max(img_bbox[0], min(event.x, img_bbox[2]))
@@ -139,22 +297,27 @@ class ImagePartSelectorApp:
             self.start_y = None
                 
     def _on_mouse_drag(self, event):
-        """Updates the rectangle as the mouse is dragged."""
-        if self.original_image and self.current_rectangle_id and self.start_x is not None:
-            # Get the bounding box of the displayed image on the canvas
-            img_bbox = self.canvas.bbox(self.image_on_canvas_id)
-            if not img_bbox: return # Should not happen if image_on_canvas_id exists
+        """Records where the mouse was dragged to, the rectangle follows on the next frame."""
+        if self.pyramid and self.current_rectangle_id and self.start_x is not None:
+            self.drag_point = (event.x, event.y)
+            self._schedule_frame()
 
-            # Clamp the current mouse position to be within the image display bounds
-            current_x = max(img_bbox[0], min(event.x, img_bbox[2]))
-            current_y = max(img_bbox[1], min(event.y, img_bbox[3]))
+    def _update_drag_rectangle(self):
+        """Moves the corner of the rectangle being dragged to the latest mouse position."""
+        img_bbox = self.drag_bbox
 
-            # Update the rectangle's coordinates
-            self.canvas.coords(self.current_rectangle_id, self.start_x, self.start_y, current_x, current_y)
+        # Clamp the current mouse position to be within the image display bounds
+        current_x = max(img_bbox[0], min(self.drag_point[0], img_bbox[2]))
+        current_y = max(img_bbox[1], min(self.drag_point[1], img_bbox[3]))
+        self.drag_point = None
+
+        # Update the rectangle's coordinates
+        self.canvas.coords(self.current_rectangle_id, self.start_x, self.start_y, current_x, current_y)
 
     def _on_mouse_up(self, event):
         """Finalizes the rectangle when mouse button 1 is released."""
-        if not self.original_image or not self.image_on_canvas_id or self.start_x is None:
+        self.drag_point = None # The release position replaces any motion not drawn yet
+        if not self.pyramid or self.start_x is None:
             self.status_label.config(text="Please load an image and click within it to select.")
             if self.current_rectangle_id:
                 self.canvas.delete(self.current_rectangle_id)
@@ -162,12 +325,7 @@ class ImagePartSelectorApp:
             return
 
         # Clamp the ending coordinates to be within the image display bounds
-        img_bbox = self.canvas.bbox(self.image_on_canvas_id)
-        if not img_bbox:
-            self.status_label.config(text="Error: Could not determine image position on canvas.")
-            self.canvas.delete(self.current_rectangle_id)
-            self.current_rectangle_id = None
-            return
+        img_bbox = self._image_bbox()
 
         end_x = max(img_bbox[0], min(event.x, img_bbox[2]))
         end_y = max(img_bbox[1], min(event.y, img_bbox[3]))
@@ -179,7 +337,7 @@ class ImagePartSelectorApp:
         norm_x2_canvas_clamped = max(self.start_x, end_x) - img_bbox[0]
         norm_y2_canvas_clamped = max(self.start_y, end_y) - img_bbox[1]
 
-        original_img_width, original_img_height = self.original_image.size
+        original_img_width, original_img_height = self.image_size
         img_display_width = img_bbox[2] - img_bbox[0]
         img_display_height = img_bbox[3] - img_bbox[1]
 
@@ -193,6 +351,18 @@ class ImagePartSelectorApp:
         scale_x = original_img_width / img_display_width
         scale_y = original_img_height / img_display_height
 
+        # A click without dragging picks the selection under the cursor instead of making a new one
+        if abs(end_x - self.start_x) < CLICK_SLOP and abs(end_y - self.start_y) < CLICK_SLOP:
+            hit = self.selected_regions.hit_test((end_x - img_bbox[0]) * scale_x, (end_y - img_bbox[1]) * scale_y)
+            if hit is not None:
+                self.canvas.delete(self.current_rectangle_id)
+                self.current_rectangle_id = None
+                self.start_x = None
+                self.start_y = None
+                self._set_active_region(hit)
+                self.status_label.config(text="Selection picked. Press Delete to remove it, Ctrl+Z to undo.")
+                return
+
         # Convert to original image coordinates using math.floor for x1, y1
         # and math.ceil for x2, y2 to ensure we capture all pixels and avoid transparent edges.
         orig_x1 = int(math.floor(norm_x1_canvas_clamped * scale_x))
@@ -215,18 +385,14 @@ class ImagePartSelectorApp:
             self.current_rectangle_id = None
             return
 
-        self.selected_regions.append((orig_x1, orig_y1, orig_x2, orig_y2))
+        region = (orig_x1, orig_y1, orig_x2, orig_y2)
+        region_id = self.selected_regions.add(region)
 
         # Redraw the rectangle on canvas permanently in a different color
         self.canvas.delete(self.current_rectangle_id) # Delete temporary
-        
-        # Draw the permanent rectangle using the actual canvas coordinates (clamped and normalized)
-        # These are the coordinates that were actually visible and selected on the canvas
-        self.canvas.create_rectangle(
-            img_bbox[0] + norm_x1_canvas_clamped, img_bbox[1] + norm_y1_canvas_clamped,
-            img_bbox[0] + norm_x2_canvas_clamped, img_bbox[1] + norm_y2_canvas_clamped,
-            outline="blue", width=2
-        ) 
+
+        # The permanent rectangle is drawn from the stored image coordinates so it follows zooming and panning
+        self._draw_selection(region_id, region)
 
         self.current_rectangle_id = None # Reset for next selection
         self.start_x = None # Reset mouse start coordinates
@@ -237,139 +403,307 @@ class ImagePartSelectorApp:
     def _clear_selections(self):
         """Clears all drawn rectangles and reset selection list."""
         if messagebox.askyesno("Clear Selections", "Are you sure you want to clear all selected areas?"):
-            self.canvas.delete("all")
-            if self.tk_image and self.image_on_canvas_id: # Redraw the original image if available
-                # Restore the image on the canvas
-                canvas_width = self.canvas.winfo_width()
-                canvas_height = self.canvas.winfo_height()
-                x_center = canvas_width / 2
-                y_center = canvas_height / 2
-                self.image_on_canvas_id = self.canvas.create_image(x_center, y_center, image=self.tk_image, anchor=tk.CENTER)
-            self.selected_regions = []
-            self.status_label.config(text="All selections cleared. Start new selections.")
+            self.canvas.delete("selection") # The image tiles stay where they are
+            self.selected_regions.clear()
+            self.active_region_id = None
+            self.status_label.config(text="All selections cleared. Start new selections (Ctrl+Z brings them back).")
+
+    def _set_active_region(self, region_id):
+        """Highlights the picked selection (None to unpick)."""
+        previous = self.active_region_id
+        self.active_region_id = region_id
+        for changed in (previous, region_id):
+            if changed is not None and self.selected_regions.get(changed):
+                self.canvas.delete(f"region{changed}")
+                self._draw_selection(changed, self.selected_regions.get(changed))
+
+    def _delete_region(self, region_id):
+        self.selected_regions.remove(region_id)
+        self.canvas.delete(f"region{region_id}")
+        if region_id == self.active_region_id:
+            self.active_region_id = None
+        self.status_label.config(text=f"Selection removed, {len(self.selected_regions)} areas selected. Ctrl+Z to undo.")
+
+    def _delete_active_region(self):
+        if self.active_region_id is not None and self._selections_editable():
+            self._delete_region(self.active_region_id)
+
+    def _on_right_click(self, event):
+        """Removes the selection under the cursor."""
+        if not self.pyramid or not self._selections_editable():
+            return
+        self._render_frame()
+        hit = self.selected_regions.hit_test((event.x - self.view_x) / self.view_scale,
+                                             (event.y - self.view_y) / self.view_scale)
+        if hit is not None:
+            self._delete_region(hit)
+
+    def _undo_selection(self):
+        self._render_frame()
+        if self._selections_editable() and self.selected_regions.undo():
+            self._after_history_change("Undone")
+
+    def _redo_selection(self):
+        self._render_frame()
+        if self._selections_editable() and self.selected_regions.redo():
+            self._after_history_change("Redone")
+
+    def _after_history_change(self, action):
+        if self.selected_regions.get(self.active_region_id) is None:
+            self.active_region_id = None
+        self._redraw_selections()
+        self.status_label.config(text=f"{action}. {len(self.selected_regions)} areas selected.")
+
+    def _selections_editable(self):
+        """Selections are locked while an export is running."""
+        return self.export_executor is None
+
+    def _reset_view(self):
+        """Forgets the current image's pyramid and tiles."""
+        if self.pyramid:
+            self.pyramid.cancelled = True # Stops its builder thread
+        self.pyramid = None
+        self.tile_cache.clear()
+        self.tile_cache_pixels = 0
+        self.visible_tiles = []
+        self.drawn_view = None
+
+    def _fit_view(self):
+        """Centers the image in the canvas at the largest scale (up to 100%) that shows all of it."""
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        width, height = self.image_size
+        self.view_scale = min(canvas_width / width, canvas_height / height, 1.0)
+        self.min_scale = self.view_scale / 2
+        self.view_x = (canvas_width - width * self.view_scale) / 2
+        self.view_y = (canvas_height - height * self.view_scale) / 2
+
+    def _image_bbox(self):
+        """Returns the (x1, y1, x2, y2) canvas box the whole image covers at the current zoom."""
+        width, height = self.image_size
+        return (self.view_x, self.view_y,
+                self.view_x + width * self.view_scale, self.view_y + height * self.view_scale)
+
+    def _request_redraw(self):
+        """Marks the view as changed, it is drawn on the next frame."""
+        self.view_dirty = True
+        self._schedule_frame()
+
+    def _schedule_frame(self):
+        if self.frame_after_id is None:
+            self.frame_after_id = self.root.after(FRAME_MS, self._render_frame)
+
+    def _render_frame(self):
+        """
+        Applies everything that changed since the last frame in one canvas update.
+        Also called directly to catch up before handling a click, so the click matches what is shown.
+        """
+        if self.frame_after_id is not None:
+            self.root.after_cancel(self.frame_after_id)
+            self.frame_after_id = None
+        if self.view_dirty:
+            self.view_dirty = False
+            self._redraw_view()
+        if self.drag_point is not None and self.current_rectangle_id:
+            self._update_drag_rectangle()
+        self.drag_point = None
+
+    def _redraw_view(self):
+        """Draws the tiles of the best built pyramid level that fall inside the canvas, then the selections."""
+        if not self.pyramid:
+            return
+        pyramid = self.pyramid
+        level = pyramid.best_ready_level(self.view_scale)
+        self.drawn_level = level
+        if level is None:
+            return
+        factor = 2 ** level
+        level_image = pyramid.levels[level]
+        tile_span = pyramid.tile_size * factor * self.view_scale # Canvas size of one tile
+
+        # Range of tiles that intersect the visible part of the canvas
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        columns = math.ceil(level_image.width / pyramid.tile_size)
+        rows = math.ceil(level_image.height / pyramid.tile_size)
+        first_column = max(0, int(-self.view_x // tile_span))
+        last_column = min(columns - 1, int((canvas_width - self.view_x) // tile_span))
+        first_row = max(0, int(-self.view_y // tile_span))
+        last_row = min(rows - 1, int((canvas_height - self.view_y) // tile_span))
+
+        self.canvas.delete("tile")
+        self.visible_tiles = []
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                # Tile edges are rounded to whole canvas pixels from image coordinates so neighbors meet without gaps
+                tile_image, (x1, y1, x2, y2) = pyramid.tile(level, column, row)
+                left = round(self.view_x + x1 * self.view_scale)
+                top = round(self.view_y + y1 * self.view_scale)
+                width = round(self.view_x + x2 * self.view_scale) - left
+                height = round(self.view_y + y2 * self.view_scale) - top
+                source_box = None
+                if width > canvas_width or height > canvas_height:
+                    # Zoomed in so far that a tile outgrows the canvas (up to 16x its size at MAX_ZOOM):
+                    # only the image pixels inside the canvas are scaled up
+                    scale_x, scale_y = width / tile_image.width, height / tile_image.height
+                    source_box = (max(0, math.floor(-left / scale_x)), max(0, math.floor(-top / scale_y)),
+                                  min(tile_image.width, math.ceil((canvas_width - left) / scale_x)),
+                                  min(tile_image.height, math.ceil((canvas_height - top) / scale_y)))
+                    right, bottom = left + round(source_box[2] * scale_x), top + round(source_box[3] * scale_y)
+                    left, top = left + round(source_box[0] * scale_x), top + round(source_box[1] * scale_y)
+                    width, height = right - left, bottom - top
+                if width <= 0 or height <= 0:
+                    continue
+                photo = self._get_tile_photo(level, column, row, tile_image, width, height, source_box)
+                self.canvas.create_image(left, top, image=photo, anchor=tk.NW, tags="tile")
+                self.visible_tiles.append(photo)
+        self.canvas.tag_lower("tile")
+
+        self._place_selections()
+
+    def _place_selections(self):
+        """
+        Brings the selection overlay to the current view. Rectangles already on the canvas are
+        scaled and moved in place by Tk instead of being deleted and created again.
+        """
+        if self.drawn_view is None:
+            self._redraw_selections()
+            return
+        old_x, old_y, old_scale = self.drawn_view
+        factor = self.view_scale / old_scale
+        if factor != 1:
+            self.canvas.scale("selection", 0, 0, factor, factor)
+        # Scaling around the canvas origin moves the image corner to old_x * factor, shift it to view_x
+        self.canvas.move("selection", self.view_x - old_x * factor, self.view_y - old_y * factor)
+        self.drawn_view = (self.view_x, self.view_y, self.view_scale)
+
+    def _redraw_selections(self):
+        self.canvas.delete("selection")
+        for region_id, region in self.selected_regions.items():
+            self._draw_selection(region_id, region)
+        self.drawn_view = (self.view_x, self.view_y, self.view_scale)
+
+    def _get_tile_photo(self, level, column, row, tile_image, width, height, source_box=None):
+        """
+        Returns the PhotoImage of a tile (or of its source_box part) at the given canvas size,
+        reusing recently used ones.
+        """
+        key = (level, column, row, width, height, source_box)
+        photo = self.tile_cache.get(key)
+        if photo is not None:
+            self.tile_cache.move_to_end(key)
+            return photo
+        if source_box is not None:
+            tile_image = tile_image.crop(source_box)
+        if tile_image.size != (width, height):
+            # Nearest neighbor when zoomed in past 100% so single pixels stay sharp for precise selections
+            resample = Image.Resampling.NEAREST if width > tile_image.width else Image.Resampling.BILINEAR
+            tile_image = tile_image.resize((width, height), resample)
+        photo = ImageTk.PhotoImage(tile_image)
+        self.tile_cache[key] = photo
+        self.tile_cache_pixels += width * height
+        while self.tile_cache_pixels > TILE_CACHE_PIXELS and len(self.tile_cache) > 1:
+            _, dropped = self.tile_cache.popitem(last=False) # Drop the least recently used tile
+            self.tile_cache_pixels -= dropped.width() * dropped.height()
+        return photo
+
+    def _draw_selection(self, region_id, region):
+        """Draws a stored selection (original image coordinates) as a permanent rectangle."""
+        x1, y1, x2, y2 = region
+        self.canvas.create_rectangle(
+            self.view_x + x1 * self.view_scale, self.view_y + y1 * self.view_scale,
+            self.view_x + x2 * self.view_scale, self.view_y + y2 * self.view_scale,
+            outline="orange" if region_id == self.active_region_id else "blue", width=2,
+            tags=("selection", f"region{region_id}")
+        )
+
+    def _poll_pyramid(self, pyramid):
+        """Repaints when the pyramid level the current zoom wants has been built in the background."""
+        if pyramid is not self.pyramid:
+            return # Another image was loaded meanwhile
+        finished = pyramid.complete # Read first: once set, everything below is already in place
+        if pyramid.error is not None:
+            self._on_load_failed(pyramid.error)
+            return
+        if self.original_image is None and pyramid.image is not None:
+            self.original_image = pyramid.image # Full decode finished, exporting is possible now
+            self.status_label.config(text=f"Full image decoded.{self._memory_note()}")
+        if pyramid.best_ready_level(self.view_scale) != self.drawn_level:
+            self._redraw_view()
+        if not finished:
+            self.root.after(PYRAMID_POLL_MS, self._poll_pyramid, pyramid)
+
+    def _cancel_drag(self):
+        """Drops a selection that is being dragged, its canvas start point is no longer valid."""
+        if self.current_rectangle_id:
+            self.canvas.delete(self.current_rectangle_id)
+        self.current_rectangle_id = None
+        self.start_x = None
+        self.start_y = None
+        self.drag_point = None
+
+    def _on_mouse_wheel(self, event):
+        """Zooms in or out keeping the image point under the cursor in place."""
+        if not self.pyramid:
+            return
+        zoom_in = event.num == 4 or event.delta > 0
+        new_scale = self.view_scale * ZOOM_STEP if zoom_in else self.view_scale / ZOOM_STEP
+        new_scale = max(self.min_scale, min(new_scale, MAX_ZOOM))
+        if new_scale == self.view_scale:
+            return
+        self._cancel_drag()
+        self.view_x = event.x - (event.x - self.view_x) * new_scale / self.view_scale
+        self.view_y = event.y - (event.y - self.view_y) * new_scale / self.view_scale
+        self.view_scale = new_scale
+        self._request_redraw()
+
+    def _on_pan_start(self, event):
+        self.pan_start = (event.x, event.y)
+
+    def _on_pan_drag(self, event):
+        """Moves the image with the mouse while the middle button is held."""
+        if not self.pyramid or not self.pan_start:
+            return
+        self._cancel_drag()
+        self.view_x += event.x - self.pan_start[0]
+        self.view_y += event.y - self.pan_start[1]
+        self.pan_start = (event.x, event.y)
+        self._request_redraw()
 
     def _inpaint_transparent_regions(self, image_rgba, transparent_regions_coords, iterations=15):
         """
         Performs a basic iterative inpainting (color diffusion) on transparent regions.
         Fills transparent pixels by averaging colors of their surrounding opaque neighbors.
         """
-        img = image_rgba.copy()
-        width, height = img.size
-
-        # Create the initial image with transparent holes where selections were
-        # This is essentially the unselected_image before inpainting
-        draw = ImageDraw.Draw(img)
-        for x1, y1, x2, y2 in transparent_regions_coords:
-            draw.rectangle([(x1, y1), (x2, y2)], fill=(0, 0, 0, 0)) # Fill with fully transparent
-
-        # Perform iterative color diffusion
-        for _ in range(iterations):
-            pixels_read = img.load() # Get pixel access for reading from current state
-            new_pixels_data = list(img.getdata()) # Copy all pixel data for writing new state efficiently
-
-            for y in range(height):
-                for x in range(width):
-                    # Check if the current pixel is transparent (part of the "hole")
-                    # We check the alpha value of the pixel from the 'pixels_read' (current state)
-                    if pixels_read[x, y][3] == 0: 
-                        r_sum, g_sum, b_sum, count = 0, 0, 0, 0
-                        
-                        # Check 3x3 neighbors (excluding itself)
-                        for dy in [-1, 0, 1]:
-                            for dx in [-1, 0, 1]:
-                                if dx == 0 and dy == 0:
-                                    continue # Skip self
-                                
-                                nx, ny = x + dx, y + dy
-                                
-                                # Check bounds and ensure neighbor is OPAQUE (has color content)
-                                if 0 <= nx < width and 0 <= ny < height:
-                                    neighbor_pixel = pixels_read[nx, ny]
-                                    if neighbor_pixel[3] > 0: # If neighbor is opaque
-                                        r_sum += neighbor_pixel[0]
-                                        g_sum += neighbor_pixel[1]
-                                        b_sum += neighbor_pixel[2]
-                                        count += 1
-                        
-                        if count > 0:
-                            # Average the colors of opaque neighbors
-                            new_r = r_sum // count
-                            new_g = g_sum // count
-                            new_b = b_sum // count
-                            # Set alpha to fully opaque (255) for the filled pixel
-                            new_pixels_data[y * width + x] = (new_r, new_g, new_b, 255)
-                        # else: If no opaque neighbors, it remains transparent for this iteration;
-                        # it will be filled in a subsequent iteration as colors propagate.
-                        # The data remains (0,0,0,0) in new_pixels_data if count is 0.
-            
-            # Update the image with the new pixel data for the next iteration
-            img = Image.new("RGBA", (width, height))
-            img.putdata(new_pixels_data) # putdata is much faster than putpixel
-        
-        return img
+        return image_slicer_core.inpaint_transparent_regions(image_rgba, transparent_regions_coords, iterations)
 
     def _feather_image_edges(self, image_rgba, feather_pixels=2):
         """
         Applies alpha feathering to the edges of an RGBA image.
         Makes pixels near the edges gradually fade to transparent.
         """
-        img = image_rgba.copy()
-        width, height = img.size
-        pixels = img.load()
-
-        # Create a new alpha channel
-        new_alpha_data = [0] * (width * height)
-
-        for y in range(height):
-            for x in range(width):
-                r, g, b, a = pixels[x, y]
-                
-                # If the pixel is already fully transparent, keep it that way
-                if a == 0:
-                    new_alpha_data[y * width + x] = 0
-                    continue
-
-                # Calculate distance to nearest edge
-                dist_left = x
-                dist_right = width - 1 - x
-                dist_top = y
-                dist_bottom = height - 1 - y
-
-                min_dist_h = min(dist_left, dist_right)
-                min_dist_v = min(dist_top, dist_bottom)
-
-                # Find the smallest distance to any edge
-                min_dist_to_edge = min(min_dist_h, min_dist_v)
-
-                if min_dist_to_edge < feather_pixels:
-                    # Calculate new alpha based on distance to edge
-                    # Linear falloff: 0 at feather_pixels, 255 at 0
-                    new_a = int(a * (min_dist_to_edge / feather_pixels))
-                    new_alpha_data[y * width + x] = new_a
-                else:
-                    # Pixel is not within feathering zone, keep its original alpha
-                    new_alpha_data[y * width + x] = a
-        
-        # Create a new image with the original RGB and the modified alpha
-        feathered_image = Image.new("RGBA", (width, height))
-        feathered_image.putdata([(pixels[i % width, i // width][0],
-                                   pixels[i % width, i // width][1],
-                                   pixels[i % width, i // width][2],
-                                   new_alpha_data[i]) for i in range(width * height)])
-        return feathered_image
+        return image_slicer_core.feather_image_edges(image_rgba, feather_pixels)
 
 
     def _process_and_save(self):
-        """Processes the selected regions and saves them along with the unselected area."""
-        if not self.original_image:
+        """
+        Processes the selected regions and saves them along with the unselected area.
+        The work runs on a pool of worker threads (PIL and NumPy release the GIL while
+        cropping, filtering and PNG encoding), progress is polled back onto the Tk
+        event loop and the Cancel button stops any part that has not been saved yet.
+        """
+        if not self.pyramid:
             messagebox.showwarning("No Image", "Please select an image first.")
             return
+        if not self.original_image:
+            messagebox.showwarning("Still Loading", "The full image is still being decoded, please try again in a moment.")
+            return
         if not self.selected_regions:
             messagebox.showwarning("No Selections", "Please select at least one area on the image.")
             return
 
         # Define feathering radius for selected parts
-        feather_radius = 2 # Adjust this value (e.g., 1, 3, 5) for desired softness
+        feather_radius = image_slicer_core.FEATHER_RADIUS # Adjust this value (e.g., 1, 3, 5) for desired softness
 
         # Create a new directory for the output
         base_name = os.path.splitext(os.path.basename(self.original_image_path))[0]
@@ -379,62 +713,171 @@ class ImagePartSelectorApp:
 
         try:
             os.makedirs(output_dir, exist_ok=True)
-            self.status_label.config(text=f"Saving images to: {output_dir}...")
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred during processing or saving: {e}")
+            self.status_label.config(text="Error during processing. Check console for details.")
+            return
 
-            width, height = self.original_image.size
+        # Snapshot what the workers need so later clicks cannot change it under them
+        source_image = self.original_image
+        # Overlapping selections are merged so the same pixels are not cut and inpainted twice
+        regions = image_slicer_core.merge_overlapping_regions(self.selected_regions)
+        if len(regions) < len(self.selected_regions):
+            print(f"Merged {len(self.selected_regions)} overlapping selections into {len(regions)} parts.")
+        cropped = self.export_cropped_var.get()
+
+        self.export_output_dir = output_dir
+        self.export_base_name = base_name
+        self.export_manifest = None
+        if cropped:
+            self.export_manifest = image_slicer_core.build_parts_manifest(
+                os.path.basename(self.original_image_path), source_image.size, base_name, regions)
+        self.export_cancel_event = threading.Event()
+        self.export_done_queue = queue.Queue()
+        self.export_total = len(regions) + 1
+        self.export_finished = 0
+        self.export_errors = []
+        # Big images get fewer workers to stay inside the memory budget, estimated like the batch CLI does
+        workers = image_slicer_core.workers_for_budget(
+            image_slicer_core.slice_memory_bytes(source_image.size, cropped),
+            image_slicer_core.MEMORY_BUDGET_MB, EXPORT_WORKERS)
+        self.export_executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+        # The background is the biggest job, so it goes first to overlap with the parts
+        jobs = [self.export_executor.submit(
+            self._export_unselected, source_image, regions, base_name, output_dir, self.export_cancel_event)]
+        for i, region in enumerate(regions):
+            jobs.append(self.export_executor.submit(
+                self._export_part, source_image, i, region, base_name, output_dir,
+                feather_radius, cropped, self.export_cancel_event))
+        for job in jobs:
+            # Runs on the worker thread, so it only hands the job back to the Tk thread
+            job.add_done_callback(self.export_done_queue.put)
+        self.export_executor.shutdown(wait=False) # Workers exit once the queued jobs are done
+
+        self._set_export_running(True)
+        self.status_label.config(text=f"Saving images to: {output_dir}... (0/{self.export_total})")
+        self.root.after(EXPORT_POLL_MS, self._poll_export_progress)
+
+    def _export_part(self, source_image, index, region, base_name, output_dir, feather_radius, cropped, cancel_event):
+        """
+        Worker job: saves one feathered cutout, either at its own size (cropped=True,
+        the offset goes into the manifest) or on a full-size transparent canvas.
+        Returns the saved path, or None if the export was cancelled first.
+        """
+        if cancel_event.is_set():
+            return None
+        part_image = image_slicer_core.render_part(source_image, region, feather_radius, cropped)
+        if cancel_event.is_set():
+            return None
+
+        # Save the part image (PNG supports transparency)
+        part_image_path = os.path.join(output_dir, image_slicer_core.part_file_name(base_name, index))
+        part_image.save(part_image_path)
+        return part_image_path
+
+    def _export_unselected(self, source_image, regions, base_name, output_dir, cancel_event):
+        """
+        Worker job: fills the selected regions from their surroundings and saves the result.
+        Returns the saved path, or None if the export was cancelled first.
+        """
+        if cancel_event.is_set():
+            return None
+        unselected_filled_image = self._inpaint_transparent_regions(
+            source_image,  # Left untouched, the function works on its own copy
+            regions,       # These are the regions to be filled
+            iterations=image_slicer_core.INPAINT_ITERATIONS
+        )
+        if cancel_event.is_set():
+            return None
 
-            # Process each selected region (cutouts with transparent backgrounds and feathered edges)
-            for i, (x1, y1, x2, y2) in enumerate(self.selected_regions):
-                # Create a new, fully transparent image of the original size (RGBA, (0,0,0,0))
-                part_image = Image.new("RGBA", (width, height), (0, 0, 0, 0)) # R=0, G=0, B=0, A=0 (fully transparent)
-                
-                # Crop the specific selected region from the original RGBA image
-                cropped_area = self.original_image.crop((x1, y1, x2, y2))
-                
-                # Apply feathering to the cropped area
-                feathered_cropped_area = self._feather_image_edges(cropped_area, feather_pixels=feather_radius)
-                
-                # Paste the feathered cropped area onto the transparent background at its *original* position
-                part_image.paste(feathered_cropped_area, (x1, y1))
-                
-                # Save the part image (PNG supports transparency)
-                part_image_name = f"{base_name}_part_{i+1}.png"
-                part_image_path = os.path.join(output_dir, part_image_name)
-                part_image.save(part_image_path)
-                print(f"Saved: {part_image_path}")
-
-            # Process the unselected area (filled with surrounding pixels)
-            # Use the inpainting function on a copy of the original image
-            unselected_filled_image = self._inpaint_transparent_regions(
-                self.original_image.copy(), # Provide a copy of the original image
-                self.selected_regions,     # These are the regions to be filled
-                iterations=15              # More iterations for better diffusion
-            )
-            
-            unselected_image_name = f"{base_name}_unselected.png"
-            unselected_image_path = os.path.join(output_dir, unselected_image_name)
-            unselected_filled_image.save(unselected_image_path)
-            print(f"Saved: {unselected_image_path}")
+        unselected_image_path = os.path.join(output_dir, image_slicer_core.unselected_file_name(base_name))
+        unselected_filled_image.save(unselected_image_path)
+        return unselected_image_path
 
-            messagebox.showinfo("Success", f"All images saved successfully in:\n{output_dir}")
-            self.status_label.config(text="Processing complete. Images saved.")
+    def _poll_export_progress(self):
+        """Collects finished export jobs on the Tk thread and updates the status bar."""
+        while True:
+            try:
+                job = self.export_done_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.export_finished += 1
+            if job.cancelled():
+                continue
+            error = job.exception()
+            if error is not None:
+                print(f"Error while exporting: {error}")
+                self.export_errors.append(error)
+                self._cancel_export() # One failure stops the rest, like the old sequential loop
+            elif job.result():
+                print(f"Saved: {job.result()}")
+
+        if self.export_finished < self.export_total:
+            state = "Cancelling" if self.export_cancel_event.is_set() else "Saving images to"
+            self.status_label.config(
+                text=f"{state}: {self.export_output_dir}... ({self.export_finished}/{self.export_total})")
+            self.root.after(EXPORT_POLL_MS, self._poll_export_progress)
+            return
 
-            # Attempt to open the output folder automatically
+        self._set_export_running(False)
+        output_dir = self.export_output_dir
+        base_name = self.export_base_name
+        if self.export_errors:
+            messagebox.showerror("Error", f"An error occurred during processing or saving: {self.export_errors[0]}")
+            self.status_label.config(text="Error during processing. Check console for details.")
+            return
+        if self.export_cancel_event.is_set():
+            self.status_label.config(text=f"Export cancelled. Files saved so far are in: {output_dir}")
+            return
+        if self.export_manifest is not None:
+            # Only written once every part it lists exists
+            manifest_path = os.path.join(output_dir, image_slicer_core.manifest_file_name(base_name))
             try:
-                os.startfile(output_dir) # For Windows
-            except AttributeError:
-                # For macOS/Linux, use 'open' or 'xdg-open'
-                import subprocess
-                subprocess.run(['open', output_dir])
+                image_slicer_core.write_manifest(self.export_manifest, manifest_path)
             except Exception as e:
-                print(f"Could not open folder automatically: {e}")
+                messagebox.showerror("Error", f"An error occurred during processing or saving: {e}")
+                self.status_label.config(text="Error during processing. Check console for details.")
+                return
+            print(f"Saved: {manifest_path}")
+
+        messagebox.showinfo("Success", f"All images saved successfully in:\n{output_dir}")
+        self.status_label.config(text=f"Processing complete. Images saved.{self._memory_note()}")
 
+        # Attempt to open the output folder automatically
+        try:
+            os.startfile(output_dir) # For Windows
+        except AttributeError:
+            # For macOS/Linux, use 'open' or 'xdg-open'
+            import subprocess
+            subprocess.run(['open', output_dir])
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred during processing or saving: {e}")
-            self.status_label.config(text="Error during processing. Check console for details.")
+            print(f"Could not open folder automatically: {e}")
+
+    def _cancel_export(self):
+        """Stops an export: queued jobs are dropped and running ones skip their save."""
+        if self.export_executor is None or self.export_cancel_event.is_set():
+            return
+        self.export_cancel_event.set()
+        self.export_executor.shutdown(wait=False, cancel_futures=True)
+        self.cancel_export_btn.config(state=tk.DISABLED)
+
+    def _set_export_running(self, running):
+        """Locks the image and selection controls while an export is running."""
+        idle_state = tk.DISABLED if running else tk.NORMAL
+        self.select_image_btn.config(state=idle_state)
+        self.clear_selections_btn.config(state=idle_state)
+        self.process_save_btn.config(state=idle_state)
+        self.export_cropped_check.config(state=idle_state)
+        self.cancel_export_btn.config(state=tk.NORMAL if running else tk.DISABLED)
+        if not running:
+            self.export_executor = None
 
 # Main execution block
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        image_slicer_core.run_inpaint_benchmark()
+        sys.exit()
     root = tk.Tk()
     app = ImagePartSelectorApp(root)
     root.mainloop()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+GUI-free character sets and bulk conversion used by "live letter replacer.py".
+
+Each set in MASTER is loaded on demand from a JSON file in the charsets folder
+(see CharsetRegistry) and compiled once into a str.translate() table, so whole
+strings, files or streams are restyled in C instead of one dict lookup per
+character. Importing this module does not need tkinter or keyboard. Run it
+directly to restyle text offline:
+
+    python letter_replacer_core.py SET [FILE ...] [-o OUTPUT] [--reverse]
+
+Without FILE the text is read from stdin; without -o it is written to stdout.
+--reverse maps a restyled text back to plain ASCII letters (SET "all" undoes
+every set at once). --list prints the available sets.
+"""
+import argparse
+import collections.abc
+import json
+import os
+import sys
+
+# Characters read and converted at a time when streaming files or stdin
+CHUNK_SIZE = 1 << 20
+# Folder of the character set files; drop another <name>.json in it to add a set
+CHARSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "charsets")
+# Set the live replacer starts with, listed first
+DEFAULT_SET = "normal"
+
+class CharsetRegistry(collections.abc.Mapping):
+    """
+    The character sets, keyed by name, read from the *.json files of a folder.
+    Only the file names are listed up front; a set's file is parsed the first
+    time the set is used, so many user-defined sets cost nothing at startup.
+
+    A file holds either {"letters": "abc...", "styled": "𝐚𝐛𝐜..."} (two strings of
+    the same length, the compact form the bundled sets use) or a plain
+    {"a": "𝐚", "b": "𝐛", ...} mapping.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self._paths = {}
+        if os.path.isdir(directory):
+            for entry in os.scandir(directory):
+                if entry.name.endswith(".json"):
+                    self._paths[entry.name[:-len(".json")]] = entry.path
+        # DEFAULT_SET first (it is what the GUI starts with), the rest in alphabetical order
+        self._names = sorted(self._paths, key=lambda name: (name != DEFAULT_SET, name))
+        self._sets = {}
+
+    def __getitem__(self, name):
+        mapping = self._sets.get(name)
+        if mapping is None:
+            with open(self._paths[name], encoding="utf-8") as f:
+                data = json.load(f)
+            if "letters" in data:
+                if len(data["letters"]) != len(data["styled"]):
+                    raise ValueError(f"{self._paths[name]}: 'letters' and 'styled' differ in length")
+                mapping = dict(zip(data["letters"], data["styled"]))
+            else:
+                mapping = data
+            self._sets[name] = mapping
+        return mapping
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._paths
+
+MASTER = CharsetRegistry(CHARSETS_DIR)
+
+_tables = {}  # (set name, reverse) -> compiled str.translate() table
+
+def translation_table(set_name, reverse=False):
+    """
+    Returns the str.translate() table of a set, compiling it on first use.
+    The reverse table maps each styled character back to its ASCII letter; when a
+    set gives two letters the same character (smallcaps 'a' and 'A') the first one,
+    lowercase, wins. set_name "all" (reverse only) undoes every set at once.
+    Styled characters that are plain ASCII (canadian's 'E' for 'e') or letters of a set are
+    left out of the reverse table, so plain text comes back unchanged.
+    """
+    key = (set_name, reverse)
+    table = _tables.get(key)
+    if table is None:
+        if not reverse:
+            mapping = MASTER[set_name]
+            if all(ord(letter) < 128 for letter in mapping):
+                # A list indexed by code point is looked up faster than a dict; characters past
+                # its end raise IndexError, which translate() leaves as they are
+                table = [mapping.get(chr(code), chr(code)) for code in range(128)]
+            else:
+                table = str.maketrans(mapping)
+        else:
+            if set_name == "all":
+                mappings = list(MASTER.values())
+            else:
+                mappings = [MASTER[set_name]]
+            letters = {letter for mapping in mappings for letter in mapping}
+            inverse = {}
+            for mapping in mappings:
+                for letter, styled in mapping.items():
+                    if styled != letter and not styled.isascii() and styled not in letters:
+                        inverse.setdefault(styled, letter)
+            table = str.maketrans(inverse)
+        _tables[key] = table
+    return table
+
+def convert(text, set_name, reverse=False):
+    """Restyles text with a set (or maps it back to ASCII with reverse=True)."""
+    return text.translate(translation_table(set_name, reverse))
+
+def convert_stream(source, destination, set_name, reverse=False, chunk_size=CHUNK_SIZE):
+    """
+    Converts a text stream into another in chunks of chunk_size characters, so
+    files of any size run in constant memory. Returns the characters converted.
+    """
+    table = translation_table(set_name, reverse)
+    total = 0
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return total
+        destination.write(chunk.translate(table))
+        total += len(chunk)
+
+def convert_file(input_path, output_path, set_name, reverse=False):
+    """Converts a UTF-8 text file into another. Returns the characters converted."""
+    with open(input_path, encoding="utf-8") as source, \
+            open(output_path, "w", encoding="utf-8") as destination:
+        return convert_stream(source, destination, set_name, reverse)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Restyle text with the letter replacer's character sets.")
+    parser.add_argument("set_name", nargs="?", help="character set, or 'all' with --reverse")
+    parser.add_argument("files", nargs="*", help="UTF-8 text files (default: stdin)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--reverse", action="store_true", help="map restyled text back to ASCII")
+    parser.add_argument("--list", action="store_true", help="print the available sets and exit")
+    args = parser.parse_intermixed_args(argv)
+
+    if args.list:
+        for name in MASTER:
+            print(f"{name:<12} {convert('The quick brown fox', name)}")
+        return 0
+    if not args.set_name:
+        parser.error("SET is required")
+    if args.set_name not in MASTER and not (args.reverse and args.set_name == "all"):
+        parser.error(f"unknown set '{args.set_name}', choose from: {', '.join(MASTER)}")
+
+    # The styled characters are outside most console code pages, so pipes are always UTF-8
+    sys.stdin.reconfigure(encoding="utf-8")
+    destination = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    if not args.output:
+        sys.stdout.reconfigure(encoding="utf-8")
+    try:
+        if not args.files:
+            convert_stream(sys.stdin, destination, args.set_name, args.reverse)
+        for path in args.files:
+            with open(path, encoding="utf-8") as source:
+                convert_stream(source, destination, args.set_name, args.reverse)
+    finally:
+        if args.output:
+            destination.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
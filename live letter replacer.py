@@ -5,15 +5,28 @@ Crash-proof live letter replacer with a GUI.
 Logs every problem to the log file in the same folder.
 Use the GUI to select a character set and toggle the replacer ON or OFF.
 
+Modes:
+- live: every letter is replaced as it is typed (a backspace and the new letter).
+- word: letters are held back and each word is typed restyled in one go when
+  it ends (space, punctuation, Enter...), without any backspaces. Shortcuts
+  (Ctrl, Alt or Windows held) end the word and go through untouched.
+
 Hotkeys:
 - Pause/Break: Toggles the replacer ON/OFF.
+- Scroll Lock: Restyles the selected text through the clipboard (one copy, one paste).
 - End: Quits the application.
+
+Run it with --benchmark to time the key hook and the injection headlessly,
+with a stand-in keyboard backend (no window, no real key presses).
 """
 import pathlib
 import traceback
 import sys
 import time
 import threading
+import queue
+from collections import deque
+import letter_replacer_core # Character sets and bulk conversion, also usable from the command line
 
 # These will be imported in the main block to handle missing libraries gracefully
 tk = None
@@ -25,111 +38,26 @@ keyboard = None
 # --------------------------------------------------------------------------- #
 LOG_FILE = pathlib.Path(__file__).with_suffix(".log")
 
-MASTER = {
-    "normal": {
-        'a':'a','b':'b','c':'c','d':'d','e':'e','f':'f','g':'g','h':'h','i':'i',
-        'j':'j','k':'k','l':'l','m':'m','n':'n','o':'o','p':'p','q':'q','r':'r',
-        's':'s','t':'t','u':'u','v':'v','w':'w','x':'x','y':'y','z':'z',
-        'A':'A','B':'B','C':'C','D':'D','E':'E','F':'F','G':'G','H':'H','I':'I',
-        'J':'J','K':'K','L':'L','M':'M','N':'N','O':'O','P':'P','Q':'Q','R':'R',
-        'S':'S','T':'T','U':'U','V':'V','W':'W','X':'X','Y':'Y','Z':'Z'
-       },
-    "bold": {
-        'a':'𝐚','b':'𝐛','c':'𝐜','d':'𝐝','e':'𝐞','f':'𝐟','g':'𝐠','h':'𝐡','i':'𝐢',
-        'j':'𝐣','k':'𝐤','l':'𝐥','m':'𝐦','n':'𝐧','o':'𝐨','p':'𝐩','q':'𝐪','r':'𝐫',
-        's':'𝐬','t':'𝐭','u':'𝐮','v':'𝐯','w':'𝐰','x':'𝐱','y':'𝐲','z':'𝐳',
-        'A':'𝐀','B':'𝐁','C':'𝐂','D':'𝐃','E':'𝐄','F':'𝐅','G':'𝐆','H':'𝐇','I':'𝐈',
-        'J':'𝐉','K':'𝐊','L':'𝐋','M':'𝐌','N':'𝐍','O':'𝐎','P':'𝐏','Q':'𝐐','R':'𝐑',
-        'S':'𝐒','T':'𝐓','U':'𝐔','V':'𝐕','W':'𝐖','X':'𝐗','Y':'𝐘','Z':'𝐙'
-    },
-     "bypass": {         
-                'a':'а','b':'b','c':'с','d':'ԁ','e':'е','f':'f','g':'ց','h':'հ','i':'і',
-                'j':'ј','k':'k','l':'ӏ','m':'m','n':'ո','o':'օ','p':'р','q':'q','r':'r',
-                's':'ѕ','t':'t','u':'ս','v':'v','w':'ᴡ','x':'х','y':'у','z':'ⴭ',
-                'A':'А','B':'В','C':'Ϲ','D':'𝖣','E':'Е','F':'𝖥','G':'Ԍ','H':'Η','I':'𐌠',
-                'J':'Ј','K':'K','L':'𝖫','M':'𝖬','N':'𝖭','O':'Օ','P':'Р','Q':'Q','R':'𝖱',
-                'S':'Տ','T':'Т','U':'Ս','V':'𝖵','W':'Ԝ','X':'Χ','Y':'Υ','Z':'Ⴭ'         },
-    "sans": {
-        'a':'𝗮','b':'𝗯','c':'𝗰','d':'𝗱','e':'𝗲','f':'𝗳','g':'𝗴','h':'𝗵','i':'𝗶',
-        'j':'𝗷','k':'𝗸','l':'𝗹','m':'𝗺','n':'𝗻','o':'𝗼','p':'𝗽','q':'𝗾','r':'𝗿',
-        's':'𝘀','t':'𝘁','u':'𝘂','v':'𝘃','w':'𝘄','x':'𝘅','y':'𝘆','z':'𝘇',
-        'A':'𝗔','B':'𝗕','C':'𝗖','D':'𝗗','E':'𝗘','F':'𝗙','G':'𝗚','H':'𝗛','I':'𝗜',
-        'J':'𝗝','K':'𝗞','L':'𝗟','M':'𝗠','N':'𝗡','O':'𝗢','P':'𝗣','Q':'𝗤','R':'𝗥',
-        'S':'𝗦','T':'𝗧','U':'𝗨','V':'𝗩','W':'𝗪','X':'𝗫','Y':'𝗬','Z':'𝗭'
-    },
-    "box": {
-        'a':'🄰','b':'🄱','c':'🄲','d':'🄳','e':'🄴','f':'🄵','g':'🄶','h':'🄷','i':'🄸',
-        'j':'🄹','k':'🄺','l':'🄻','m':'🄼','n':'🄽','o':'🄾','p':'🄿','q':'🅀','r':'🅁',
-        's':'🅂','t':'🅃','u':'🅄','v':'🅅','w':'🅆','x':'🅇','y':'🅈','z':'🅉',
-        'A':'🄰','B':'🄱','C':'🄲','D':'🄳','E':'🄴','F':'🄵','G':'🄶','H':'🄷','I':'🄸',
-        'J':'🄹','K':'🄺','L':'🄻','M':'🄼','N':'🄽','O':'🄾','P':'🄿','Q':'🅀','R':'🅁',
-        'S':'🅂','T':'🅃','U':'🅄','V':'🅅','W':'🅆','X':'🅇','Y':'🅈','Z':'🅉'
-    },
-    "square": {
-        'a':'🅰','b':'🅱','c':'🅲','d':'🅳','e':'🅴','f':'🅵','g':'🅶','h':'🅷','i':'🅸',
-        'j':'🅹','k':'🅺','l':'🅻','m':'🅼','n':'🅽','o':'🅾','p':'🅿','q':'🆀','r':'🆁',
-        's':'🆂','t':'🆃','u':'🆄','v':'🆅','w':'🆆','x':'🆇','y':'🆈','z':'🆉',
-        'A':'🅰','B':'🅱','C':'🅲','D':'🅳','E':'🅴','F':'🅵','G':'🅶','H':'🅷','I':'🅸',
-        'J':'🅹','K':'🅺','L':'🅻','M':'🅼','N':'🅽','O':'🅾','P':'🅿','Q':'🆀','R':'🆁',
-        'S':'🆂','T':'🆃','U':'🆄','V':'🆅','W':'🆆','X':'🆇','Y':'🆈','Z':'🆉'
-    },
-    "circle": {
-        'a':'ⓐ','b':'ⓑ','c':'ⓒ','d':'ⓓ','e':'ⓔ','f':'ⓕ','g':'ⓖ','h':'ⓗ','i':'ⓘ',
-        'j':'ⓙ','k':'ⓚ','l':'ⓛ','m':'ⓜ','n':'ⓝ','o':'ⓞ','p':'ⓟ','q':'ⓠ','r':'ⓡ',
-        's':'ⓢ','t':'ⓣ','u':'ⓤ','v':'ⓥ','w':'ⓦ','x':'ⓧ','y':'ⓨ','z':'ⓩ',
-        'A':'Ⓐ','B':'Ⓑ','C':'Ⓒ','D':'Ⓓ','E':'Ⓔ','F':'Ⓕ','G':'Ⓖ','H':'Ⓗ','I':'Ⓘ',
-        'J':'Ⓙ','K':'Ⓚ','L':'Ⓛ','M':'Ⓜ','N':'Ⓝ','O':'Ⓞ','P':'Ⓟ','Q':'Ⓠ','R':'Ⓡ',
-        'S':'Ⓢ','T':'Ⓣ','U':'Ⓤ','V':'Ⓥ','W':'Ⓦ','X':'Ⓧ','Y':'Ⓨ','Z':'Ⓩ'
-    },
-    "monospace": {
-        'a':'𝚊','b':'𝚋','c':'𝚌','d':'𝚍','e':'𝚎','f':'𝚏','g':'𝚐','h':'𝚑','i':'𝚒',
-        'j':'𝚓','k':'𝚔','l':'𝚕','m':'𝚖','n':'𝚗','o':'𝚘','p':'𝚙','q':'𝚚','r':'𝚛',
-        's':'𝚜','t':'𝚝','u':'𝚞','v':'𝚟','w':'𝚠','x':'𝚡','y':'𝚢','z':'𝚣',
-        'A':'𝙰','B':'𝙱','C':'𝙲','D':'𝙳','E':'𝙴','F':'𝙵','G':'𝙶','H':'𝙷','I':'𝙸',
-        'J':'𝙹','K':'𝙺','L':'𝙻','M':'𝙼','N':'𝙽','O':'𝙾','P':'𝙿','Q':'𝚀','R':'𝚁',
-        'S':'𝚂','T':'𝚃','U':'𝚄','V':'𝚅','W':'𝚆','X':'𝚇','Y':'𝚈','Z':'𝚉'
-    },
-    "canadian": {
-        'a':'ᗩ','b':'ᗷ','c':'ᑕ','d':'ᗪ','e':'E','f':'ᖴ','g':'G','h':'ᕼ','i':'Ӏ',
-        'j':'ᒍ','k':'K','l':'ᒪ','m':'ᗰ','n':'ᑎ','o':'O','p':'ᑭ','q':'Q','r':'ᖇ',
-        's':'S','t':'T','u':'ᑌ','v':'ᐯ','w':'ᗯ','x':'᙭','y':'Y','z':'Z',
-        'A':'ᗩ','B':'ᗷ','C':'ᑕ','D':'ᗪ','E':'E','F':'ᖴ','G':'G','H':'ᕼ','I':'I',
-        'J':'ᒍ','K':'K','L':'ᒪ','M':'ᗰ','N':'ᑎ','O':'O','P':'ᑭ','Q':'Q','R':'ᖇ',
-        'S':'S','T':'T','U':'ᑌ','V':'ᐯ','W':'ᗯ','X':'᙭','Y':'Y','Z':'Z'
-    },
-    "fraktur": {
-        'a':'𝖆','b':'𝖇','c':'𝖈','d':'𝖉','e':'𝖊','f':'𝖋','g':'𝖌','h':'𝖍','i':'𝖎',
-        'j':'𝖏','k':'𝖐','l':'𝖑','m':'𝖒','n':'𝖓','o':'𝖔','p':'𝖕','q':'𝖖','r':'𝖗',
-        's':'𝖘','t':'𝖙','u':'𝖚','v':'𝖛','w':'𝖜','x':'𝖝','y':'𝖞','z':'𝖟',
-        'A':'𝕬','B':'𝕭','C':'𝕮','D':'𝕯','E':'𝕰','F':'𝕱','G':'𝕲','H':'𝕳','I':'𝕴',
-        'J':'𝕵','K':'𝕶','L':'𝕷','M':'𝕸','N':'𝕹','O':'𝕺','P':'𝕻','Q':'𝕼','R':'𝕽',
-        'S':'𝕾','T':'𝕿','U':'𝖀','V':'𝖁','W':'𝖂','X':'𝖃','Y':'𝖄','Z':'𝖅'
-    },
-    "italic": {
-        'a':'𝘢','b':'𝘣','c':'𝘤','d':'𝘥','e':'𝘦','f':'𝘧','g':'𝘨','h':'𝘩','i':'𝘪',
-        'j':'𝘫','k':'𝘬','l':'𝘭','m':'𝘮','n':'𝘯','o':'𝘰','p':'𝘱','q':'𝘲','r':'𝘳',
-        's':'𝘴','t':'𝘵','u':'𝘶','v':'𝘷','w':'𝘸','x':'𝘹','y':'𝘺','z':'𝘻',
-        'A':'𝘈','B':'𝘉','C':'𝘊','D':'𝘋','E':'𝘌','F':'𝘍','G':'𝘎','H':'𝘏','I':'𝘐',
-        'J':'𝘑','K':'𝘒','L':'𝘓','M':'𝘔','N':'𝘕','O':'𝘖','P':'𝘗','Q':'𝘘','R':'𝘙',
-        'S':'𝘚','T':'𝘛','U':'𝘜','V':'𝘝','W':'𝘞','X':'𝘟','Y':'𝘠','Z':'𝘡'
-    },
-    "double": {
-        'a':'𝕒','b':'𝕓','c':'𝕔','d':'𝕕','e':'𝕖','f':'𝕗','g':'𝕘','h':'𝕙','i':'𝕚',
-        'j':'𝕛','k':'𝕜','l':'𝕝','m':'𝕞','n':'𝕟','o':'𝕠','p':'𝕡','q':'𝕢','r':'𝕣',
-        's':'𝕤','t':'𝕥','u':'𝕦','v':'𝕧','w':'𝕨','x':'𝕩','y':'𝕪','z':'𝕫',
-        'A':'𝔸','B':'𝔹','C':'ℂ','D':'𝔻','E':'𝔼','F':'𝔽','G':'𝔾','H':'ℍ','I':'𝕀',
-        'J':'𝕁','K':'𝕂','L':'𝕃','M':'𝕄','N':'ℕ','O':'𝕆','P':'ℙ','Q':'ℚ','R':'ℝ',
-        'S':'𝕊','T':'𝕋','U':'𝕌','V':'𝕍','W':'𝕎','X':'𝕏','Y':'𝕐','Z':'ℤ'
-    },
-    "smallcaps": {
-        'a':'ᴀ','b':'ʙ','c':'ᴄ','d':'ᴅ','e':'ᴇ','f':'ꜰ','g':'ɢ','h':'ʜ','i':'ɪ',
-        'j':'ᴊ','k':'ᴋ','l':'ʟ','m':'ᴍ','n':'ɴ','o':'ᴏ','p':'ᴘ','q':'ǫ','r':'ʀ',
-        's':'ꜱ','t':'ᴛ','u':'ᴜ','v':'ᴠ','w':'ᴡ','x':'x','y':'ʏ','z':'ᴢ',
-        'A':'ᴀ','B':'ʙ','C':'ᴄ','D':'ᴅ','E':'ᴇ','F':'ꜰ','G':'ɢ','H':'ʜ','I':'ɪ',
-        'J':'ᴊ','K':'ᴋ','L':'ʟ','M':'ᴍ','N':'ɴ','O':'ᴏ','P':'ᴘ','Q':'ǫ','R':'ʀ',
-        'S':'ꜱ','T':'ᴛ','U':'ᴜ','V':'ᴠ','W':'ᴡ','X':'x','Y':'ʏ','Z':'ᴢ'
-    }
-}
+# The character sets live in the GUI-free module, which can also restyle whole texts.
+# MASTER is a registry: set names are known at startup, each set is read from its
+# file in the charsets folder when it is first selected.
+MASTER = letter_replacer_core.MASTER
+
+MODES = ("live", "word")
+# Keys that make the next key a shortcut rather than a letter in word mode
+SHORTCUT_MODIFIERS = ('ctrl', 'alt', 'windows')
+# Hotkey that restyles the selection of the focused window, and how long that window
+# gets to answer the copy and the paste
+SELECTION_HOTKEY = 'scroll lock'
+CLIPBOARD_WAIT_MS = 100
+
+# --benchmark: typing speeds to replay (keys per second, 0 = as fast as possible), keys per
+# run, time the stand-in backend takes per injected key, and the most a hook call may take
+# (at the 99th percentile) before the run is flagged; a slow hook makes the OS drop input.
+BENCHMARK_RATES = (20, 60, 200, 0)
+BENCHMARK_KEYS = 200
+BENCHMARK_INJECT_MS = 0.5
+HOOK_BUDGET_MS = 1.0
 
 # --------------------------------------------------------------------------- #
 # 2.  Crash Logger                                                            #
@@ -141,19 +69,94 @@ def log_exc():
         f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
         traceback.print_exc(file=f)
 
+def percentile(values, p):
+    """The p-th percentile (0-100, nearest rank) of some numbers, None if there are none."""
+    values = sorted(values)
+    if not values:
+        return None
+    return values[round(p / 100 * (len(values) - 1))]
+
 # --------------------------------------------------------------------------- #
-# 3.  GUI Application Class                                                   #
+# 3.  Injection Worker                                                        #
+# --------------------------------------------------------------------------- #
+class InjectionWorker:
+    """
+    Types the replacement characters from one long-lived thread, in the order the
+    keys were pressed. Replacements that queue up while an injection is running
+    are sent as one burst: a backspace per letter, then a single keyboard.write().
+    Whole words (word mode) are typed the same way, just without the backspaces.
+    """
+    LATENCY_HISTORY = 500   # how many recent key-to-injection times are kept
+
+    def __init__(self):
+        self.queue = queue.Queue()  # (backspaces, text, key to press after it, time of key press), None = stop
+        self.latencies = deque(maxlen=self.LATENCY_HISTORY)  # seconds from key press to injection
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        """Lets the worker finish what is queued, then exit."""
+        self.queue.put(None)
+
+    def submit(self, char):
+        """Queues one replacement; called from the keyboard hook, so it must not block."""
+        self.queue.put((1, char, None, time.perf_counter()))
+
+    def submit_text(self, text, key=None):
+        """Queues text to type as it is, then the key (e.g. 'enter') to press after it, if any."""
+        self.queue.put((0, text, key, time.perf_counter()))
+
+    @property
+    def depth(self):
+        """Replacements waiting to be injected."""
+        return self.queue.qsize()
+
+    def latency_ms(self, p):
+        """Key-to-injection latency percentile p (0-100) over recent replacements, None if there were none."""
+        value = percentile(self.latencies, p)
+        return None if value is None else value * 1000
+
+    def run(self):
+        item = self.queue.get()
+        while item is not None:
+            batch = [item]
+            taken = False  # True when the loop below already took the next item (or the stop)
+            # Take everything else that is already waiting, up to a key to press (it has to come
+            # after its text) and only of one kind (a live replacement deletes its letter first)
+            while batch[-1][2] is None:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None or item[0] != batch[0][0]:
+                    taken = True
+                    break
+                batch.append(item)
+            try:
+                for _ in range(sum(backspaces for backspaces, _, _, _ in batch)):
+                    keyboard.send('backspace')                # remove original letters
+                keyboard.write("".join(text for _, text, _, _ in batch))  # send replacements
+                if batch[-1][2]:
+                    keyboard.send(batch[-1][2])
+            except Exception:
+                log_exc()
+            injected = time.perf_counter()
+            self.latencies.extend(injected - pressed for _, _, _, pressed in batch)
+            if not taken:
+                item = self.queue.get()
+
+# --------------------------------------------------------------------------- #
+# 4.  GUI Application Class                                                   #
 # --------------------------------------------------------------------------- #
 class ReplacerApp:
     # 1.  All methods exist before anyone tries to call them
     def update_status_label(self):
         status = "ON" if self.shared_state["active"] else "OFF"
-        set_name = "None"
-        for name, tbl in MASTER.items():
-            if tbl is self.shared_state["table"]:
-                set_name = name
-                break
-        self.status_var.set(f"Status: {status}  |  Set: {set_name}")
+        set_name = self.shared_state["set_name"]
+        mode = self.shared_state["mode"]
+        self.status_var.set(f"Status: {status}  |  Set: {set_name}  |  Mode: {mode}")
 
     def toggle_active(self):
         self.shared_state["active"] = not self.shared_state["active"]
@@ -162,7 +165,8 @@ class ReplacerApp:
 
     def on_set_select(self, _event=None):
         set_name = self.set_var.get()
-        self.shared_state["table"] = MASTER[set_name]
+        # Name and table change together, so the status never has to search for the name
+        self.shared_state.update(set_name=set_name, table=MASTER[set_name])
         print(f"Switched to set: {set_name}")
         self.update_status_label()
 
@@ -173,17 +177,25 @@ class ReplacerApp:
         master.attributes('-topmost', False)
         master.resizable(False, False)
 
-        self.shared_state = {"table": MASTER["normal"], "active": True}
+        default_set = letter_replacer_core.DEFAULT_SET
+        self.shared_state = {"set_name": default_set, "table": MASTER[default_set], "active": True, "mode": "live"}
+        self.injector = InjectionWorker()
+        self.hook = None            # handle of the installed key hook, see install_hook()
+        self.word_buffer = []       # letters held back in word mode
+        self.held_keys = set()      # held-back letters whose release has to be held back too
+        self.word_lock = threading.Lock()  # word_buffer/held_keys, shared by the hook and install_hook()
 
         self.build_widgets()
         self.start_keyboard_listener()
         self.update_status_label()          # safe now
+        self.update_stats_label()
         self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def on_closing(self):
         """Handle the window closing event."""
         print("Window closed. Cleaning up...")
         keyboard.unhook_all()
+        self.injector.stop()
         self.master.destroy()
 
     def build_widgets(self):
@@ -195,7 +207,7 @@ class ReplacerApp:
         set_label = ttk.Label(main_frame, text="Select Character Set:")
         set_label.grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
 
-        self.set_var = tk.StringVar(value="normal")          # current selection
+        self.set_var = tk.StringVar(value=self.shared_state["set_name"])  # current selection
         self.combo = ttk.Combobox(main_frame,
                                   textvariable=self.set_var,
                                   values=list(MASTER.keys()),
@@ -204,22 +216,48 @@ class ReplacerApp:
         self.combo.grid(row=0, column=1, sticky=tk.W, padx=(5, 0))
         self.combo.bind("<<ComboboxSelected>>", self.on_set_select)
 
+        # --- Drop-down for the mode ---
+        mode_label = ttk.Label(main_frame, text="Mode:")
+        mode_label.grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+
+        self.mode_var = tk.StringVar(value=self.shared_state["mode"])
+        mode_combo = ttk.Combobox(main_frame,
+                                  textvariable=self.mode_var,
+                                  values=MODES,
+                                  state="readonly",
+                                  width=15)
+        mode_combo.grid(row=1, column=1, sticky=tk.W, padx=(5, 0))
+        mode_combo.bind("<<ComboboxSelected>>", self.on_mode_select)
+
         # --- Status Label ---
         self.status_var = tk.StringVar()
         status_label = ttk.Label(main_frame, textvariable=self.status_var, font=("Segoe UI", 9))
-        status_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
+        status_label.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
 
         # --- Buttons ---
         toggle_button = ttk.Button(main_frame, text="Toggle ON/OFF", command=self.toggle_active)
-        toggle_button.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        toggle_button.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
 
         quit_button = ttk.Button(main_frame, text="Quit", command=self.on_closing)
-        quit_button.grid(row=2, column=1, sticky=(tk.W, tk.E), pady=(5, 0))
+        quit_button.grid(row=3, column=1, sticky=(tk.W, tk.E), pady=(5, 0))
+
+        # --- Injection stats ---
+        self.stats_var = tk.StringVar()
+        stats_label = ttk.Label(main_frame, textvariable=self.stats_var, font=("Segoe UI", 8))
+        stats_label.grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+
+    def update_stats_label(self):
+        """Shows the injection queue depth and latency, refreshed twice a second."""
+        p50, p99 = self.injector.latency_ms(50), self.injector.latency_ms(99)
+        latency = f"{p50:.1f} / {p99:.1f} ms" if p50 is not None else "-"
+        self.stats_var.set(f"Queue: {self.injector.depth}  |  Latency p50/p99: {latency}")
+        self.master.after(500, self.update_stats_label)
 
     def on_set_select(self, _event=None):
         """Called when the user picks a new set from the drop-down."""
         set_name = self.set_var.get()
-        self.shared_state["table"] = MASTER[set_name]
+        # Name and table change together, so the status never has to search for the name
+        self.shared_state.update(set_name=set_name, table=MASTER[set_name])
         print(f"Switched to set: {set_name}")
         self.update_status_label()
 
@@ -228,9 +266,139 @@ class ReplacerApp:
         self.shared_state["active"] = not self.shared_state["active"]
         print(f"Active state toggled to: {self.shared_state['active']}")
         self.update_status_label()
+
+    def on_mode_select(self, _event=None):
+        """Called when the user picks live or word mode from the drop-down."""
+        self.shared_state["mode"] = self.mode_var.get()
+        self.install_hook()
+        print(f"Switched to mode: {self.shared_state['mode']}")
+        self.update_status_label()
+
+    def replace_selection(self):
+        """
+        Restyles the text selected in the focused window with one copy and one paste
+        instead of retyping it letter by letter, then puts the old clipboard text back.
+        Runs on the Tk thread, which owns the clipboard.
+        """
+        try:
+            saved = self.master.clipboard_get()
+        except tk.TclError:  # clipboard empty or not text
+            saved = None
+        self.master.clipboard_clear()
+        keyboard.send('ctrl+c')
+        self.master.after(CLIPBOARD_WAIT_MS, self._paste_selection, saved)
+
+    def _paste_selection(self, saved):
+        try:
+            text = self.master.clipboard_get()
+        except tk.TclError:  # nothing was selected
+            text = ""
+        if text:
+            self.master.clipboard_clear()
+            self.master.clipboard_append(letter_replacer_core.convert(text, self.shared_state["set_name"]))
+            self.master.update()  # hand the new text to the system clipboard before pasting
+            keyboard.send('ctrl+v')
+            print(f"Replaced a selection of {len(text)} characters.")
+        self.master.after(CLIPBOARD_WAIT_MS, self._restore_clipboard, saved)
+
+    def _restore_clipboard(self, saved):
+        self.master.clipboard_clear()
+        if saved is not None:
+            self.master.clipboard_append(saved)
+
+    def install_hook(self):
+        """
+        (Re)installs the key hook for the current mode. Word mode has to hold keys back,
+        so its hook suppresses; live mode lets every key through and deletes it afterwards.
+        Called from the Tk thread too, so the word buffer is only touched under word_lock.
+        """
+        old_hook = self.hook
+        if self.shared_state["mode"] == "word":
+            self.hook = keyboard.hook(self.word_handler, suppress=True)
+        else:
+            self.hook = keyboard.hook(self.live_handler)
+        if old_hook is not None:
+            keyboard.unhook(old_hook)
+        with self.word_lock:  # waits for a word_handler call that is still running
+            self.held_keys.clear()
+            word = self.take_word()
+        if word:  # a word typed before switching is still owed
+            self.injector.submit_text(word)
+
+    def take_word(self):
+        """Empties the word buffer and returns the held-back word restyled. Call with word_lock held."""
+        if not self.word_buffer:
+            return ""
+        word = letter_replacer_core.convert("".join(self.word_buffer), self.shared_state["set_name"])
+        self.word_buffer.clear()
+        return word
+
+    def live_handler(self, event):
+        """
+        Key hook of live mode, runs for every key event. Keys pressed while Ctrl, Alt or
+        Windows is held (shortcuts, the Scroll Lock copy and paste) are not replaced.
+        """
+        if not self.shared_state["active"] or event.is_keypad:
+            return True  # Let key through
+        if event.event_type != keyboard.KEY_DOWN:
+            return True  # Only the press types a letter, the release would replace it twice
+
+        c = event.name  # 'a', 'b', 'shift+a' …
+        if len(c) == 1 and c.isascii() and c.isalpha():
+            if any(keyboard.is_pressed(name) for name in SHORTCUT_MODIFIERS):
+                return True  # a shortcut, not typing
+            repl = self.shared_state["table"].get(c)
+            if repl and repl != c:  # We want to replace (a letter mapped to itself needs nothing)
+                # The injection thread types it, in key order, so the hook never blocks
+                self.injector.submit(repl)
+                return False  # Suppress original keypress
+        return True  # Let anything else through
+
+    def word_handler(self, event):
+        """
+        Key hook of word mode, runs for every key event. Letters are held back; the key
+        that ends the word has the whole restyled word typed in one write, followed by
+        that key itself (typed along with the word when it is a character). Ctrl, Alt and
+        Windows end the word as they go down, and keys pressed while they are held (shortcuts,
+        the Scroll Lock copy and paste) go through untouched.
+        """
+        c = event.name
+        with self.word_lock:
+            if event.event_type != keyboard.KEY_DOWN:
+                if c.lower() in self.held_keys:
+                    self.held_keys.discard(c.lower())
+                    return False  # the release of a held-back letter is held back too
+                return True
+            if keyboard.is_modifier(c) and any(name in c for name in SHORTCUT_MODIFIERS):
+                word = self.take_word()
+                if word:  # typed right away, before the shortcut's key comes
+                    self.injector.submit_text(word)
+                return True
+            if (not self.shared_state["active"] or event.is_keypad
+                    or any(keyboard.is_pressed(name) for name in SHORTCUT_MODIFIERS)):
+                return True  # a shortcut, not typing
+            if len(c) == 1 and c.isascii() and c.isalpha():
+                self.word_buffer.append(c)
+                self.held_keys.add(c.lower())
+                return False
+            if c == 'backspace' and self.word_buffer:
+                self.word_buffer.pop()  # the letter was never typed, so just forget it
+                return False
+            if not self.word_buffer or keyboard.is_modifier(c):
+                return True  # nothing held back, or only shift going down
+            word = self.take_word()
+
+        if c == 'space':
+            self.injector.submit_text(word + " ")
+        elif len(c) == 1:
+            self.injector.submit_text(word + c)
+        else:
+            self.injector.submit_text(word, key=c)
+        return False  # the injection thread presses it after the word
     
     def start_keyboard_listener(self):
         """Starts the keyboard monitoring in a separate daemon thread."""
+        self.injector.start()
         listener_thread = threading.Thread(target=self.keyboard_listener_worker, daemon=True)
         listener_thread.start()
     
@@ -239,34 +407,15 @@ class ReplacerApp:
         This function runs in the background thread.
         It sets up the keyboard hooks and hotkeys.
         """
-        # --- Helper for replacement ---
-        def replace_one(char):
-            """Inject the replacement character."""
-            keyboard.send('backspace')  # remove original letter
-            keyboard.write(char)        # send replacement
-
-        # --- Main keyboard event handler ---
-        def handler(event):
-            """This callback runs for every key event."""
-            if not self.shared_state["active"] or event.is_keypad:
-                return True  # Let key through
-
-            c = event.name  # 'a', 'b', 'shift+a' …
-            if len(c) == 1 and c.isascii() and c.isalpha():
-                repl = self.shared_state["table"].get(c)
-                if repl:  # We want to replace
-                    # Do the replacement in another quick thread to avoid blocking the hook
-                    threading.Thread(target=replace_one, args=(repl,), daemon=True).start()
-                    return False  # Suppress original keypress
-            return True  # Let anything else through
-
         # Use add_hotkey for global toggles, it's cleaner
         keyboard.add_hotkey('pause', self.toggle_active)
         keyboard.add_hotkey('end', self.on_closing)
-        
+        # The clipboard belongs to the Tk thread, so the selection is handled there
+        keyboard.add_hotkey(SELECTION_HOTKEY, lambda: self.master.after(0, self.replace_selection))
+
         # Install the low-level hook for character replacement
-        keyboard.hook(handler)
-        print("Keyboard listener started. Use the GUI or hotkeys (Pause, End).")
+        self.install_hook()
+        print("Keyboard listener started. Use the GUI or hotkeys (Pause, Scroll Lock, End).")
         # The hook will run as long as the main program is alive.
         # We use a threading event to keep this worker thread alive until the app closes.
         stop_event = threading.Event()
@@ -276,9 +425,179 @@ class ReplacerApp:
 
 
 # --------------------------------------------------------------------------- #
-# 4.  Entry Point                                                             #
+# 5.  Benchmark                                                               #
+# --------------------------------------------------------------------------- #
+class StubKeyboard:
+    """
+    Stands in for the keyboard module in --benchmark: hooks are kept in a list,
+    and every injected key only takes BENCHMARK_INJECT_MS. Calls are counted.
+    The replay keeps `pressed` up to date, as the real backend does before its hooks run.
+    """
+    KEY_DOWN = "down"
+    KEY_UP = "up"
+
+    def __init__(self):
+        self.hooks = []
+        self.calls = 0  # send() and write() calls
+        self.sent = []  # what send() and write() were given
+        self.pressed = set()
+
+    def hook(self, callback, suppress=False):
+        self.hooks.append(callback)
+        return callback
+
+    def unhook(self, callback):
+        self.hooks.remove(callback)
+
+    def unhook_all(self):
+        self.hooks.clear()
+
+    def add_hotkey(self, *args, **kwargs):
+        pass
+
+    def is_modifier(self, key):
+        return key in ("shift", "ctrl", "alt", "windows")
+
+    def is_pressed(self, key):
+        return key in self.pressed
+
+    def send(self, key):
+        self.calls += 1
+        self.sent.append(key)
+        time.sleep(BENCHMARK_INJECT_MS / 1000)
+
+    def write(self, text):
+        self.calls += 1
+        self.sent.append(text)
+        time.sleep(BENCHMARK_INJECT_MS / 1000 * len(text))
+
+class StubKeyEvent:
+    def __init__(self, name, event_type):
+        self.name = name
+        self.event_type = event_type
+        self.is_keypad = False
+
+def typing_events(text):
+    """The key events of typing text: (name, down/up) pairs, with shift held for capitals."""
+    events = []
+    for char in text:
+        name = "space" if char == " " else char
+        if char.isupper():
+            events.append(("shift", "down"))
+        events += [(name, "down"), (name, "up")]
+        if char.isupper():
+            events.append(("shift", "up"))
+    return events
+
+class HeadlessReplacer(ReplacerApp):
+    """The replacer's key hooks and injection worker without the window."""
+    def __init__(self, set_name, mode):
+        self.shared_state = {"set_name": set_name, "table": MASTER[set_name], "active": True, "mode": mode}
+        self.injector = InjectionWorker()
+        self.hook = None
+        self.word_buffer = []
+        self.held_keys = set()
+        self.word_lock = threading.Lock()
+
+    def replay(self, events, before_key=None):
+        """
+        Feeds (name, down/up) events to the installed hook, calling before_key() ahead of each
+        key press. Returns the time each hook call took and the events the hook let through.
+        """
+        hook = keyboard.hooks[-1]
+        hook_seconds = []
+        passed = []
+        for name, event_type in events:
+            if event_type == "down":
+                if before_key is not None and name != "shift":
+                    before_key()
+                keyboard.pressed.add(name)
+            else:
+                keyboard.pressed.discard(name)
+            event = StubKeyEvent(name, keyboard.KEY_DOWN if event_type == "down" else keyboard.KEY_UP)
+            before = time.perf_counter()
+            if hook(event):
+                passed.append((name, event_type))
+            hook_seconds.append(time.perf_counter() - before)
+        return hook_seconds, passed
+
+def check_shortcut(set_name, mode):
+    """
+    Types "hi", then Ctrl+C (what the Scroll Lock hotkey sends), in the given mode: only the
+    word has to be typed, before the shortcut, and Ctrl and C have to reach the focused window
+    untouched. Returns True if they do.
+    """
+    replacer = HeadlessReplacer(set_name, mode)
+    replacer.injector.start()
+    replacer.install_hook()
+    keyboard.sent.clear()
+    chord = [("ctrl", "down"), ("c", "down"), ("c", "up"), ("ctrl", "up")]
+    _, passed = replacer.replay(typing_events("hi") + chord)
+    replacer.injector.stop()
+    replacer.injector.thread.join()
+    keyboard.unhook_all()
+    typed = "".join(key for key in keyboard.sent if key != 'backspace')
+    ok = passed[-len(chord):] == chord and typed == letter_replacer_core.convert("hi", set_name)
+    print(f"{mode:>5} mode Ctrl+C after a word: {'ok' if ok else 'FAILED'} "
+          f"(passed through {passed[-len(chord):]}, typed {keyboard.sent})")
+    return ok
+
+def run_benchmark(set_name="bold"):
+    """
+    Replays typing at each of BENCHMARK_RATES through the real hooks and injection
+    worker, once per mode, and prints the hook time and key-to-injection latency
+    (in word mode, from the key that ends the word). Returns False if a hook went
+    over HOOK_BUDGET_MS at the 99th percentile, or if word mode broke a shortcut.
+    """
+    global keyboard
+    keyboard = StubKeyboard()
+    sample = "The quick brown fox jumps over the lazy dog. "
+    text = (sample * (BENCHMARK_KEYS // len(sample) + 1))[:BENCHMARK_KEYS]
+    events = typing_events(text)
+    letters = sum(char.isalpha() for char in text)
+    print(f"Benchmark: {len(text)} keys of '{set_name}', {BENCHMARK_INJECT_MS} ms per injected key, "
+          f"hook budget {HOOK_BUDGET_MS} ms (p99).")
+    within_budget = True
+    for mode in MODES:
+        for rate in BENCHMARK_RATES:
+            replacer = HeadlessReplacer(set_name, mode)
+            replacer.injector.start()
+            replacer.install_hook()
+            keyboard.calls = 0
+            started = time.perf_counter()
+            typed = 0
+
+            def wait_for_key():
+                # Holds each key press back until its time at this typing speed
+                nonlocal typed
+                delay = started + typed / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                typed += 1
+
+            hook_seconds, _ = replacer.replay(events, wait_for_key if rate else None)
+            replacer.install_hook()  # types the word still held back in word mode
+            replacer.injector.stop()
+            replacer.injector.thread.join()
+            keyboard.unhook_all()
+
+            hook_p50, hook_p99 = percentile(hook_seconds, 50) * 1e6, percentile(hook_seconds, 99) * 1e6
+            latency_p50, latency_p99 = replacer.injector.latency_ms(50), replacer.injector.latency_ms(99)
+            over = hook_p99 > HOOK_BUDGET_MS * 1000
+            within_budget = within_budget and not over
+            print(f"{mode:>5} {rate or 'max':>4} keys/s: hook p50 {hook_p50:.0f} us, p99 {hook_p99:.0f} us, "
+                  f"max {max(hook_seconds) * 1e6:.0f} us | injection p50 {latency_p50:.1f} ms, p99 {latency_p99:.1f} ms | "
+                  f"{keyboard.calls / letters:.2f} injection calls per letter"
+                  + ("  << OVER BUDGET" if over else ""))
+    shortcuts_ok = all([check_shortcut(set_name, mode) for mode in MODES])
+    return shortcuts_ok and within_budget
+
+# --------------------------------------------------------------------------- #
+# 6.  Entry Point                                                             #
 # --------------------------------------------------------------------------- #
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        sys.exit(0 if run_benchmark() else 1)
     try:
         # Import necessary libraries here to provide a clear error message
         # if they are not installed.
@@ -0,0 +1,49 @@
+import struct
+import zlib
+
+import pytest
+from PIL import Image
+
+import image_slicer_core
+
+
+def write_png_header(path, width, height):
+    """A PNG that declares width x height RGB pixels but holds almost no data (never decoded)."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(b"\x00")))
+        f.write(chunk(b"IEND", b""))
+
+
+@pytest.fixture
+def huge_png(tmp_path):
+    path = tmp_path / "huge.png"
+    write_png_header(path, 20000, 10000)  # 200 MP, past Pillow's default limit of about 179 MP
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def restore_pixel_limit():
+    yield
+    image_slicer_core.set_pixel_limit(image_slicer_core.MEMORY_BUDGET_MB)
+
+
+def test_default_budget_opens_200_mp_header(huge_png):
+    assert image_slicer_core.estimate_image_bytes(huge_png) == image_slicer_core.slice_memory_bytes((20000, 10000))
+    with image_slicer_core.open_image(huge_png) as image:
+        assert image.size == (20000, 10000)
+
+
+def test_image_past_the_budget_gets_a_clear_error(huge_png):
+    image_slicer_core.set_pixel_limit(256)
+    with pytest.raises(ValueError, match="memory budget"):
+        image_slicer_core.estimate_image_bytes(huge_png)
+
+
+def test_no_budget_means_no_pixel_limit(huge_png):
+    image_slicer_core.set_pixel_limit(0)
+    assert Image.MAX_IMAGE_PIXELS is None
+    assert image_slicer_core.estimate_image_bytes(huge_png) > 0
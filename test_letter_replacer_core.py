@@ -0,0 +1,22 @@
+import string
+
+import pytest
+
+import letter_replacer_core
+
+PLAIN_TEXT = "HELLO WORLD, Quick Tests 123! " + string.ascii_letters
+
+
+@pytest.mark.parametrize("set_name", list(letter_replacer_core.MASTER) + ["all"])
+def test_reverse_leaves_plain_ascii_alone(set_name):
+    assert letter_replacer_core.convert(PLAIN_TEXT, set_name, reverse=True) == PLAIN_TEXT
+
+
+def test_reverse_undoes_a_set():
+    styled = letter_replacer_core.convert("Good Day", "bold")
+    assert letter_replacer_core.convert(styled, "bold", reverse=True) == "Good Day"
+    assert letter_replacer_core.convert(styled, "all", reverse=True) == "Good Day"
+
+
+def test_reverse_of_ascii_styled_letters():
+    assert letter_replacer_core.convert("GOOD", "canadian", reverse=True) == "GOOD"